@@ -1,14 +1,66 @@
 import os
 import logging
 import re
+import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Tuple
+
+from rate_limit import backoff_delay, get_concurrency_controller, get_rate_limiter, is_rate_limit_error
 
 
 logger = logging.getLogger(__name__)
 
-_last_call_time: Optional[float] = None
+# One SDK client per process (reused across calls: connection pool + keep-alive).
+_GEMINI_CLIENT: Optional[Tuple[str, Any]] = None  # (api_key, client)
+_CLIENT_LOCK = threading.Lock()
+
+_RETRY_RE = re.compile(r"Please retry in ([0-9]+(?:\.[0-9]+)?)s")
+_RETRY_RE2 = re.compile(r"retryDelay'?: '([0-9]+)s'")
+
+
+# SDK module resolved on first use: (module, "google-genai" | "google-generativeai").
+_GENAI_MODULE: Any = None
+_GENAI_SDK: Optional[str] = None
+
+
+def _get_genai() -> Tuple[Any, str]:
+    """Import the Gemini SDK once per process (newer `google-genai` first)."""
+    global _GENAI_MODULE, _GENAI_SDK
+    if _GENAI_SDK is not None:
+        return _GENAI_MODULE, _GENAI_SDK
+    try:
+        from google import genai  # type: ignore
+
+        sdk = "google-genai"
+    except ImportError:
+        try:
+            import google.generativeai as genai  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError(
+                "Gemini SDK not installed. Install `google-genai` (recommended) or `google-generativeai`."
+            ) from exc
+        sdk = "google-generativeai"
+    _GENAI_MODULE, _GENAI_SDK = genai, sdk
+    return genai, sdk
+
+
+def _get_client(genai: Any, api_key: str) -> Any:
+    global _GEMINI_CLIENT
+    with _CLIENT_LOCK:
+        if _GEMINI_CLIENT is None or _GEMINI_CLIENT[0] != api_key:
+            _GEMINI_CLIENT = (api_key, genai.Client(api_key=api_key))
+        return _GEMINI_CLIENT[1]
+
+
+_DOTENV_LOADED = False
+
+
+def _reload_dotenv() -> None:
+    """Forget the memoized .env load and read the file again (tests, changed cwd)."""
+    global _DOTENV_LOADED
+    _DOTENV_LOADED = False
+    _load_dotenv()
 
 
 def _load_dotenv() -> None:
@@ -16,7 +68,12 @@ def _load_dotenv() -> None:
 
     This is a tiny built-in replacement for python-dotenv.
     It never overwrites variables that are already set.
+    The file is read once per process; see `_reload_dotenv()` to force a re-read.
     """
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    _DOTENV_LOADED = True
 
     candidates = [
         Path.cwd() / ".env",
@@ -72,37 +129,44 @@ def call_gemini(prompt: str, *, model: str = "gemini-flash-lite-latest") -> str:
     if env_model:
         model = env_model
 
-    # Optional throttle for low rate limits (best-effort; per-process).
-    # Example: GEMINI_MIN_DELAY_MS=6500  (safe for 10 req/min)
-    global _last_call_time
+    # Rate limit (best-effort; per-process, shared across threads):
+    # - GEMINI_RPM: max calls per sliding 60s window (0 = unlimited).
+    # - GEMINI_MIN_DELAY_MS (legacy) is converted to an RPM when GEMINI_RPM is unset.
+    # - GEMINI_MAX_CONCURRENCY: cap of the AIMD concurrency controller.
     try:
-        raw_min_delay = os.getenv("GEMINI_MIN_DELAY_MS")
-        if raw_min_delay is None:
-            # Sensible default for flash-lite free tier (often 10 req/min).
-            min_delay_ms = 6500 if "flash-lite" in (model or "").lower() else 0
+        raw_rpm = os.getenv("GEMINI_RPM")
+        if raw_rpm is not None:
+            rpm = int(raw_rpm or "0")
         else:
-            min_delay_ms = int(raw_min_delay or "0")
+            raw_min_delay = os.getenv("GEMINI_MIN_DELAY_MS")
+            if raw_min_delay is None:
+                # Sensible default for flash-lite free tier (often 10 req/min).
+                min_delay_ms = 6500 if "flash-lite" in (model or "").lower() else 0
+            else:
+                min_delay_ms = int(raw_min_delay or "0")
+            rpm = (60000 // min_delay_ms) if min_delay_ms > 0 else 0
     except ValueError:
-        min_delay_ms = 0
-    if min_delay_ms > 0 and _last_call_time is not None:
-        elapsed_ms_since_last = (time.perf_counter() - _last_call_time) * 1000.0
-        remaining_ms = min_delay_ms - elapsed_ms_since_last
-        if remaining_ms > 0:
-            time.sleep(remaining_ms / 1000.0)
+        rpm = 0
+    try:
+        max_concurrency = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4") or "4")
+    except ValueError:
+        max_concurrency = 4
+    limiter = get_rate_limiter("gemini", rpm)
+    controller = get_concurrency_controller("gemini", max_concurrency)
 
     started = time.perf_counter()
     prompt_len = len(prompt or "")
 
-    # Newer SDK: google-genai
-    try:
-        from google import genai  # type: ignore
+    genai, sdk = _get_genai()
 
+    # Newer SDK: google-genai
+    if sdk == "google-genai":
         try:
-            max_retries = int(os.getenv("GEMINI_MAX_RETRIES", "2") or "2")
+            max_retries = int(os.getenv("GEMINI_MAX_RETRIES", "5") or "5")
         except ValueError:
-            max_retries = 2
+            max_retries = 5
 
-        client = genai.Client(api_key=api_key)
+        client = _get_client(genai, api_key)
 
         for attempt in range(max_retries + 1):
             logger.info(
@@ -113,7 +177,11 @@ def call_gemini(prompt: str, *, model: str = "gemini-flash-lite-latest") -> str:
                 max_retries + 1,
             )
             try:
-                response = client.models.generate_content(model=model, contents=prompt)
+                with controller.slot():
+                    limiter.wait_if_throttled()
+                    call_started = time.perf_counter()
+                    response = client.models.generate_content(model=model, contents=prompt)
+                controller.on_success(time.perf_counter() - call_started)
                 text: Optional[str] = getattr(response, "text", None)
                 if text:
                     out = text.strip()
@@ -127,12 +195,13 @@ def call_gemini(prompt: str, *, model: str = "gemini-flash-lite-latest") -> str:
                     len(out),
                     elapsed_ms,
                 )
-                _last_call_time = time.perf_counter()
                 return out
             except Exception as exc:
                 # Best-effort handling for rate limits (429).
                 exc_text = str(exc)
-                is_429 = "429" in exc_text or "RESOURCE_EXHAUSTED" in exc_text
+                is_429 = is_rate_limit_error(exc)
+                if is_429:
+                    controller.on_throttle()
                 if not is_429 or attempt >= max_retries:
                     elapsed_ms = (time.perf_counter() - started) * 1000.0
                     logger.exception(
@@ -145,39 +214,38 @@ def call_gemini(prompt: str, *, model: str = "gemini-flash-lite-latest") -> str:
 
                 # Parse suggested retry delay.
                 retry_s = None
-                m = re.search(r"Please retry in ([0-9]+(?:\.[0-9]+)?)s", exc_text)
+                m = _RETRY_RE.search(exc_text)
                 if m:
                     retry_s = float(m.group(1))
                 else:
-                    m2 = re.search(r"retryDelay'?: '([0-9]+)s'", exc_text)
+                    m2 = _RETRY_RE2.search(exc_text)
                     if m2:
                         retry_s = float(m2.group(1))
 
-                if retry_s is None:
-                    retry_s = max(1.0, (min_delay_ms / 1000.0) or 1.0)
+                sleep_s = backoff_delay(attempt, retry_s)
 
                 logger.warning(
                     "Gemini rate limit hit; sleeping %.1fs then retrying (%d/%d)",
-                    retry_s,
+                    sleep_s,
                     attempt + 1,
                     max_retries + 1,
                 )
-                time.sleep(retry_s)
+                time.sleep(sleep_s)
         raise RuntimeError("Gemini API call failed after retries.")
-    except ImportError:
-        pass
 
     # Older SDK: google-generativeai
     try:
-        import google.generativeai as genai  # type: ignore
-
         logger.info(
             "Gemini API call: start (sdk=google-generativeai, model=%s, prompt_chars=%d)",
             model,
             prompt_len,
         )
         genai.configure(api_key=api_key)
-        response = genai.GenerativeModel(model).generate_content(prompt)
+        with controller.slot():
+            limiter.wait_if_throttled()
+            call_started = time.perf_counter()
+            response = genai.GenerativeModel(model).generate_content(prompt)
+        controller.on_success(time.perf_counter() - call_started)
         out = (response.text or "").strip()
         elapsed_ms = (time.perf_counter() - started) * 1000.0
         logger.info(
@@ -186,13 +254,10 @@ def call_gemini(prompt: str, *, model: str = "gemini-flash-lite-latest") -> str:
             len(out),
             elapsed_ms,
         )
-        _last_call_time = time.perf_counter()
         return out
-    except ImportError as exc:
-        raise RuntimeError(
-            "Gemini SDK not installed. Install `google-genai` (recommended) or `google-generativeai`."
-        ) from exc
-    except Exception:
+    except Exception as exc:
+        if is_rate_limit_error(exc):
+            controller.on_throttle()
         elapsed_ms = (time.perf_counter() - started) * 1000.0
         logger.exception(
             "Gemini API call: error (sdk=google-generativeai, model=%s, prompt_chars=%d, elapsed_ms=%.1f)",
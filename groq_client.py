@@ -1,18 +1,53 @@
 import os
 import logging
+import re
+import threading
 import time
 from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from rate_limit import backoff_delay, get_concurrency_controller, get_rate_limiter, is_rate_limit_error
 
 
 logger = logging.getLogger(__name__)
 
+# One SDK client per process (reused across calls: connection pool + keep-alive).
+_GROQ_CLIENT: Optional[Tuple[str, Any]] = None  # (api_key, client)
+_CLIENT_LOCK = threading.Lock()
+
+# Groq error messages: "... Please try again in 7.66s." (or "in 1m2.5s").
+_RETRY_RE = re.compile(r"Please try again in (?:([0-9]+)m)?([0-9]+(?:\.[0-9]+)?)s")
+
+
+def _get_client(groq_cls: Any, api_key: str) -> Any:
+    global _GROQ_CLIENT
+    with _CLIENT_LOCK:
+        if _GROQ_CLIENT is None or _GROQ_CLIENT[0] != api_key:
+            _GROQ_CLIENT = (api_key, groq_cls(api_key=api_key))
+        return _GROQ_CLIENT[1]
+
+
+_DOTENV_LOADED = False
+
+
+def _reload_dotenv() -> None:
+    """Forget the memoized .env load and read the file again (tests, changed cwd)."""
+    global _DOTENV_LOADED
+    _DOTENV_LOADED = False
+    load_dotenv()
+
 
 def load_dotenv() -> None:
     """Load key-value pairs from a local .env file into os.environ.
 
     Tiny built-in replacement for python-dotenv.
     It never overwrites variables that are already set.
+    The file is read once per process; see `_reload_dotenv()` to force a re-read.
     """
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    _DOTENV_LOADED = True
 
     candidates = [
         Path.cwd() / ".env",
@@ -41,6 +76,20 @@ def load_dotenv() -> None:
         return
 
 
+def _retry_after_s(exc: BaseException) -> Optional[float]:
+    """Server-suggested delay of a 429: `retry-after` header, else the error message."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    m = _RETRY_RE.search(str(exc))
+    if m:
+        return 60.0 * float(m.group(1) or 0) + float(m.group(2))
+    return None
+
+
 def is_groq_configured() -> bool:
     load_dotenv()
     return bool(os.getenv("GROQ_API_KEY"))
@@ -58,43 +107,87 @@ def call_groq(prompt: str, *, model: str = "llama-3.1-8b-instant") -> str:
     if not api_key:
         raise RuntimeError("Missing API key. Set GROQ_API_KEY in your environment.")
 
+    # Rate limit (best-effort; per-process, shared across threads):
+    # GROQ_RPM = max calls per sliding 60s window (0 = unlimited),
+    # GROQ_MAX_CONCURRENCY = cap of the AIMD concurrency controller.
+    try:
+        rpm = int(os.getenv("GROQ_RPM", "0") or "0")
+    except ValueError:
+        rpm = 0
+    try:
+        max_concurrency = int(os.getenv("GROQ_MAX_CONCURRENCY", "4") or "4")
+    except ValueError:
+        max_concurrency = 4
+    limiter = get_rate_limiter("groq", rpm)
+    controller = get_concurrency_controller("groq", max_concurrency)
+
+    try:
+        max_retries = int(os.getenv("GROQ_MAX_RETRIES", "5") or "5")
+    except ValueError:
+        max_retries = 5
+
     started = time.perf_counter()
     prompt_len = len(prompt or "")
 
     try:
         from groq import Groq  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError("Groq SDK not installed. Install `groq`.") from exc
 
-        logger.info(
-            "Groq API call: start (model=%s, prompt_chars=%d)",
-            model,
-            prompt_len,
-        )
-        client = Groq(api_key=api_key)
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-        )
+    client = _get_client(Groq, api_key)
 
-        content = (resp.choices[0].message.content or "").strip()
-        elapsed_ms = (time.perf_counter() - started) * 1000.0
+    for attempt in range(max_retries + 1):
         logger.info(
-            "Groq API call: success (model=%s, response_chars=%d, elapsed_ms=%.1f)",
-            model,
-            len(content),
-            elapsed_ms,
-        )
-        return content
-    except ImportError as exc:
-        raise RuntimeError("Groq SDK not installed. Install `groq`.") from exc
-    except Exception:
-        elapsed_ms = (time.perf_counter() - started) * 1000.0
-        logger.exception(
-            "Groq API call: error (model=%s, prompt_chars=%d, elapsed_ms=%.1f)",
+            "Groq API call: start (model=%s, prompt_chars=%d, attempt=%d/%d)",
             model,
             prompt_len,
-            elapsed_ms,
+            attempt + 1,
+            max_retries + 1,
         )
-        raise
+        try:
+            with controller.slot():
+                limiter.wait_if_throttled()
+                call_started = time.perf_counter()
+                resp = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0,
+                )
+            controller.on_success(time.perf_counter() - call_started)
+
+            content = (resp.choices[0].message.content or "").strip()
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            logger.info(
+                "Groq API call: success (model=%s, response_chars=%d, elapsed_ms=%.1f)",
+                model,
+                len(content),
+                elapsed_ms,
+            )
+            return content
+        except Exception as exc:
+            # Best-effort handling for rate limits (429).
+            is_429 = is_rate_limit_error(exc)
+            if is_429:
+                controller.on_throttle()
+            if not is_429 or attempt >= max_retries:
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                logger.exception(
+                    "Groq API call: error (model=%s, prompt_chars=%d, elapsed_ms=%.1f)",
+                    model,
+                    prompt_len,
+                    elapsed_ms,
+                )
+                raise
+
+            sleep_s = backoff_delay(attempt, _retry_after_s(exc))
+
+            logger.warning(
+                "Groq rate limit hit; sleeping %.1fs then retrying (%d/%d)",
+                sleep_s,
+                attempt + 1,
+                max_retries + 1,
+            )
+            time.sleep(sleep_s)
+    raise RuntimeError("Groq API call failed after retries.")
@@ -1,8 +1,33 @@
-from collections import Counter, defaultdict
+from collections import Counter
 import math
 from typing import Optional
 
-from corpus import preprocess
+import numpy as np
+
+from corpus import preprocess_query
+from ranking import top_k_order
+
+try:
+    from numba import njit  # type: ignore
+
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+if _NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _bm25_accumulate(term_ids, idfs, posting_ptr, posting_docs, posting_tfs, len_norm, k1, scores_out):
+        # Boucle sequentielle sur les termes: deux termes peuvent toucher le meme document,
+        # une boucle parallele (prange) ecrirait en concurrence dans scores_out.
+        for q in range(term_ids.shape[0]):
+            t = term_ids[q]
+            idf = idfs[q]
+            for p in range(posting_ptr[t], posting_ptr[t + 1]):
+                d = posting_docs[p]
+                tf = posting_tfs[p]
+                scores_out[d] += idf * tf * (k1 + 1) / (tf + len_norm[d])
 
 
 class BM25Model:
@@ -13,49 +38,94 @@ class BM25Model:
         self.doc_lens = {doc_id: len(tokens) for doc_id, tokens in corpus.items()}
         self.avgdl = (sum(self.doc_lens.values()) / len(corpus)) if corpus else 0.0  # Longueur moyenne
         self.N = len(corpus)
-        self.doc_freqs = self._compute_df()
-        self._tf = {doc_id: Counter(tokens) for doc_id, tokens in corpus.items()}
+        # Un seul passage sur le corpus: le df se deduit des cles de chaque Counter.
+        self._tf = {}
+        self.doc_freqs = Counter()
+        for doc_id, tokens in corpus.items():
+            tf = self._tf[doc_id] = Counter(tokens)
+            self.doc_freqs.update(tf.keys())
+
+        # Index inverse au format CSR: les postings du terme d'indice i sont
+        # _posting_docs / _posting_tfs[_posting_ptr[i]:_posting_ptr[i + 1]].
+        self._doc_ids = list(corpus.keys())
+        self._term_index = {term: i for i, term in enumerate(self.doc_freqs)}
+        postings = [[] for _ in self._term_index]
+        for j, doc_id in enumerate(self._doc_ids):
+            for term, tf in self._tf[doc_id].items():
+                postings[self._term_index[term]].append((j, tf))
+        self._posting_ptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in postings], out=self._posting_ptr[1:])
+        flat = [entry for p in postings for entry in p]
+        self._posting_docs = np.array([j for j, _ in flat], dtype=np.int64)
+        self._posting_tfs = np.array([tf for _, tf in flat], dtype=np.float64)
+        # Formule IDF specifique BM25 [cite: 2380], calculee une fois pour tout le vocabulaire.
+        self._idf_table = {
+            term: math.log((self.N - df + 0.5) / (df + 0.5) + 1) for term, df in self.doc_freqs.items()
+        }
+        self._idf_vec = np.fromiter(
+            (self._idf_table[term] for term in self._term_index), dtype=np.float64, count=len(self._term_index)
+        )
+        self._doc_lens_arr = np.array([self.doc_lens[doc_id] for doc_id in self._doc_ids], dtype=np.float64)
+        if self.avgdl > 0:
+            self._len_norm = self.k1 * (1 - self.b + self.b * (self._doc_lens_arr / self.avgdl))
+        else:
+            self._len_norm = np.full(self.N, self.k1)
 
     def _compute_df(self):
         df = Counter()
-        for tokens in self.corpus.values():
-            df.update(set(tokens))
+        for tf in self._tf.values():
+            df.update(tf.keys())
         return df
 
     def _idf(self, term):
-        # Formule IDF specifique BM25 [cite: 2380]
-        n_qi = self.doc_freqs[term]
-        return math.log((self.N - n_qi + 0.5) / (n_qi + 0.5) + 1)
+        # Table precalculee dans __init__ (terme absent du corpus: df = 0).
+        idf = self._idf_table.get(term)
+        if idf is None:
+            return math.log((self.N + 0.5) / 0.5 + 1)
+        return idf
 
     def search(self, query: str, top_k: Optional[int] = None):
-        ranked = self._search_all(query)
-        if top_k is not None:
-            return ranked[:top_k]
-        return ranked
-
-    def _search_all(self, query: str):
-        query_tokens = preprocess(query)
-        scores = defaultdict(float)
-        
-        for doc_id, doc_tokens in self.corpus.items():
-            doc_len = self.doc_lens.get(doc_id, len(doc_tokens))
-            term_counts = self._tf.get(doc_id)
-            if term_counts is None:
-                term_counts = Counter(doc_tokens)
-            
-            for term in query_tokens:
-                if term not in self.doc_freqs:
-                    continue
-                
-                tf = term_counts[term]
-                idf = self._idf(term)
-                
-                numerator = tf * (self.k1 + 1)
-                if self.avgdl > 0:
-                    denom_norm = (1 - self.b + self.b * (doc_len / self.avgdl))
-                else:
-                    denom_norm = 1.0
-                denominator = tf + self.k1 * denom_norm
-                scores[doc_id] += idf * (numerator / denominator)
-                
-        return sorted(scores.items(), key=lambda x: x[1], reverse=True)
\ No newline at end of file
+        scores = self._score_docs(query)
+        if scores is None:
+            return []
+        # Selection partielle si top_k; a score egal, l'ordre du corpus est conserve.
+        return [(self._doc_ids[i], float(scores[i])) for i in top_k_order(scores, top_k)]
+
+    def _score_docs(self, query: str) -> Optional[np.ndarray]:
+        """Scores BM25 de tous les documents (ordre du corpus), ou None si aucun terme connu."""
+        # Termes uniques de la requete presents dans le corpus; un terme repete compte
+        # plusieurs fois, via son multiplicateur plutot qu'une ligne recalculee.
+        query_counts = Counter(t for t in preprocess_query(query) if t in self._term_index)
+        if not query_counts:
+            return None
+
+        term_ids = np.fromiter(
+            (self._term_index[t] for t in query_counts), dtype=np.int64, count=len(query_counts)
+        )
+        idfs = self._idf_vec[term_ids] * np.fromiter(
+            query_counts.values(), dtype=np.float64, count=len(query_counts)
+        )
+
+        # On ne parcourt que les postings des termes de la requete; les autres documents
+        # gardent un score nul.
+        if _NUMBA_AVAILABLE:
+            scores = np.zeros(self.N)
+            _bm25_accumulate(
+                term_ids, idfs, self._posting_ptr, self._posting_docs, self._posting_tfs,
+                self._len_norm, float(self.k1), scores,
+            )
+            return scores
+
+        doc_parts = []
+        weight_parts = []
+        for i, idf in zip(term_ids.tolist(), idfs.tolist()):
+            start, end = self._posting_ptr[i], self._posting_ptr[i + 1]
+            docs = self._posting_docs[start:end]
+            tf = self._posting_tfs[start:end]
+            doc_parts.append(docs)
+            weight_parts.append(idf * tf * (self.k1 + 1) / (tf + self._len_norm[docs]))
+        return np.bincount(
+            np.concatenate(doc_parts),
+            weights=np.concatenate(weight_parts),
+            minlength=self.N,
+        )
@@ -1,10 +1,29 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from functools import lru_cache
+import heapq
+from operator import itemgetter
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from corpus import STOPWORDS, preprocess
 
+try:
+    from numba import njit  # type: ignore
+
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# Little-endian so that the uint8 view used by packbits/unpackbits matches bit j = document j.
+_WORD = np.dtype("<u8")
+
+# A parenthesis, or a run of characters that are neither whitespace nor parentheses.
+_QUERY_PART_RE = re.compile(r"\(|\)|[^\s()]+")
+
 
 @dataclass(frozen=True)
 class _BoolToken:
@@ -18,18 +37,7 @@ def _tokenize_boolean_query(query: str) -> List[_BoolToken]:
         return []
 
     # Tokenize while preserving parentheses and operators.
-    parts: List[str] = []
-    buf = ""
-    for ch in raw:
-        if ch in "()":
-            if buf.strip():
-                parts.extend(buf.strip().split())
-            parts.append(ch)
-            buf = ""
-        else:
-            buf += ch
-    if buf.strip():
-        parts.extend(buf.strip().split())
+    parts = _QUERY_PART_RE.findall(raw)
 
     tokens: List[_BoolToken] = []
     for p in parts:
@@ -81,24 +89,105 @@ def _to_rpn(tokens: Sequence[_BoolToken]) -> List[_BoolToken]:
     return out
 
 
-def _eval_rpn(rpn: Sequence[_BoolToken], doc_terms: Iterable[str]) -> bool:
-    doc_set = set(doc_terms)
-    stack: List[bool] = []
-    for tok in rpn:
-        if tok.kind == "TERM":
-            stack.append(tok.value in doc_set)
-        elif tok.kind == "NOT":
-            a = stack.pop() if stack else False
-            stack.append(not a)
-        elif tok.kind == "AND":
-            b = stack.pop() if stack else False
-            a = stack.pop() if stack else False
-            stack.append(a and b)
-        elif tok.kind == "OR":
-            b = stack.pop() if stack else False
-            a = stack.pop() if stack else False
-            stack.append(a or b)
-    return bool(stack[-1]) if stack else False
+# Integer opcodes of a compiled query (see `_compile_query`).
+_OP_TERM = 0
+_OP_AND = 1
+_OP_OR = 2
+_OP_NOT = 3
+_OPCODES = {"TERM": _OP_TERM, "AND": _OP_AND, "OR": _OP_OR, "NOT": _OP_NOT}
+
+
+if _NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _eval_program(ops, rows, postings, full):
+        """Evaluate opcodes over packed bitsets (one preallocated stack row per operand).
+
+        Missing operands count as the empty set, like False in a per-document evaluation.
+        """
+        n_words = full.shape[0]
+        stack = np.zeros((ops.shape[0] + 1, n_words), dtype=np.uint64)
+        sp = 0
+        for i in range(ops.shape[0]):
+            op = ops[i]
+            if op == _OP_TERM:
+                for w in range(n_words):
+                    stack[sp, w] = postings[rows[i], w]
+                sp += 1
+            elif op == _OP_NOT:
+                if sp == 0:
+                    stack[0, :] = 0
+                    sp = 1
+                for w in range(n_words):
+                    stack[sp - 1, w] = ~stack[sp - 1, w] & full[w]
+            else:
+                # b = top (or empty), a = below it (or empty); the result replaces a.
+                if sp == 0:
+                    stack[0, :] = 0
+                    sp = 1
+                elif sp == 1:
+                    if op == _OP_AND:
+                        stack[0, :] = 0
+                else:
+                    for w in range(n_words):
+                        if op == _OP_AND:
+                            stack[sp - 2, w] &= stack[sp - 1, w]
+                        else:
+                            stack[sp - 2, w] |= stack[sp - 1, w]
+                    sp -= 1
+        if sp == 0:
+            return np.zeros(n_words, dtype=np.uint64)
+        return stack[sp - 1].copy()
+
+
+def _eval_program_py(ops: np.ndarray, rows: np.ndarray, postings: np.ndarray, full: np.ndarray) -> np.ndarray:
+    """NumPy version of `_eval_program` (used when numba is not installed)."""
+    empty = np.zeros_like(full)
+    stack: List[np.ndarray] = []
+    for op, row in zip(ops.tolist(), rows.tolist()):
+        if op == _OP_TERM:
+            stack.append(postings[row])
+        elif op == _OP_NOT:
+            a = stack.pop() if stack else empty
+            stack.append(~a & full)
+        else:
+            b = stack.pop() if stack else empty
+            a = stack.pop() if stack else empty
+            stack.append(a & b if op == _OP_AND else a | b)
+    return stack[-1] if stack else empty
+
+
+def _n_words(n_docs: int) -> int:
+    return (n_docs + 63) // 64
+
+
+def _pack_bits(doc_indices: Sequence[int], n_docs: int) -> np.ndarray:
+    bits = np.zeros(_n_words(n_docs) * 64, dtype=bool)
+    bits[list(doc_indices)] = True
+    return np.packbits(bits, bitorder="little").view(_WORD)
+
+
+@lru_cache(maxsize=4096)
+def _compile_query(query: str) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Tokenize + implicit AND + RPN, as (opcodes, term per opcode); memoized per query string.
+
+    Terms stay strings (ids depend on each model's index); "" for operators.
+    Clear with `_compile_query.cache_clear()`.
+    """
+    tokens = _tokenize_boolean_query(query)
+
+    # AND implicite entre deux TERM consecutifs.
+    expanded: List[_BoolToken] = []
+    for tok in tokens:
+        if expanded and expanded[-1].kind == "TERM" and tok.kind == "TERM":
+            expanded.append(_BoolToken("AND"))
+        expanded.append(tok)
+
+    # An unbalanced "(" can be left in the RPN; evaluation ignores it.
+    rpn = [tok for tok in _to_rpn(expanded) if tok.kind in _OPCODES]
+    ops = np.array([_OPCODES[tok.kind] for tok in rpn], dtype=np.int8)
+    ops.flags.writeable = False  # Shared through the cache.
+    return ops, tuple(tok.value for tok in rpn)
 
 
 class BooleanModel:
@@ -110,27 +199,42 @@ class BooleanModel:
 
     def __init__(self, corpus: Dict[str, List[str]]):
         self.corpus = corpus
+        # Index inverse: pour chaque terme, bitset des documents qui le contiennent
+        # (mot uint64 j // 64, bit j % 64 pour le j-eme document de `doc_ids`).
+        self.doc_ids: List[str] = list(corpus.keys())
+        doc_lists: Dict[str, List[int]] = {}
+        for j, tokens in enumerate(corpus.values()):
+            for term in set(tokens):
+                doc_lists.setdefault(term, []).append(j)
+        n_docs = len(self.doc_ids)
+        # Une ligne par terme, plus une derniere ligne vide pour les termes inconnus.
+        self._term_row: Dict[str, int] = {term: i for i, term in enumerate(doc_lists)}
+        self._postings_matrix = np.zeros((len(doc_lists) + 1, _n_words(n_docs)), dtype=_WORD)
+        for term, docs in doc_lists.items():
+            self._postings_matrix[self._term_row[term]] = _pack_bits(docs, n_docs)
+        self.postings: Dict[str, np.ndarray] = {
+            term: self._postings_matrix[row] for term, row in self._term_row.items()
+        }
+        # Tous les documents (les bits au-dela de N restent a 0, pour NOT).
+        self._full = _pack_bits(range(n_docs), n_docs)
 
     def search(self, query: str, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
-        tokens = _tokenize_boolean_query(query)
-        if not tokens:
+        ops, terms = _compile_query(query)
+        if not ops.size:
             return []
 
-        # AND implicite entre deux TERM consecutifs.
-        expanded: List[_BoolToken] = []
-        for tok in tokens:
-            if expanded and expanded[-1].kind == "TERM" and tok.kind == "TERM":
-                expanded.append(_BoolToken("AND"))
-            expanded.append(tok)
-
-        rpn = _to_rpn(expanded)
-        results: List[Tuple[str, float]] = []
-        for doc_id, doc_terms in self.corpus.items():
-            if _eval_rpn(rpn, doc_terms):
-                results.append((doc_id, 1.0))
+        unknown = len(self._term_row)
+        rows = np.array([self._term_row.get(term, unknown) for term in terms], dtype=np.int64)
+        evaluate = _eval_program if _NUMBA_AVAILABLE else _eval_program_py
+        matches = evaluate(ops, rows, self._postings_matrix, self._full)
+        bits = np.unpackbits(matches.view(np.uint8), bitorder="little")[: len(self.doc_ids)]
+        results: List[Tuple[str, float]] = [(self.doc_ids[j], 1.0) for j in np.flatnonzero(bits)]
 
         # Deterministic order: by doc_id (scores identical)
-        results.sort(key=lambda x: x[0])
+        if top_k is not None and 0 < top_k < len(results):
+            # Partial selection: only the top_k smallest doc_ids are sorted.
+            return heapq.nsmallest(top_k, results, key=itemgetter(0))
+        results.sort(key=itemgetter(0))
         if top_k is not None:
             return results[:top_k]
         return results
\ No newline at end of file
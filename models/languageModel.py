@@ -2,7 +2,45 @@ from collections import Counter
 import math
 from typing import Dict, Optional
 
-from corpus import preprocess
+import numpy as np
+
+from corpus import preprocess_query
+from ranking import top_k_order
+
+try:
+    from numba import njit  # type: ignore
+
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+if _NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _score_jm(q_ids, lam_col, one_minus_lam, doc_term_ids, doc_term_probs, doc_offsets, scores_out):
+        # Meme formule (et meme ordre des operations) que la boucle Python de `search`;
+        # lam_col[q] = lam * P(q|Mc) est calcule une fois par terme de la requete.
+        # Les termes de chaque document sont tries: recherche dichotomique du terme.
+        # Boucle sequentielle: `benchmark` appelle deja `search` depuis plusieurs threads, et la
+        # couche de threads "workqueue" de Numba interrompt le processus si plusieurs threads
+        # appellent un noyau parallel=True en meme temps.
+        for d in range(doc_offsets.shape[0] - 1):
+            start = doc_offsets[d]
+            end = doc_offsets[d + 1]
+            log_score = 0.0
+            for q in range(q_ids.shape[0]):
+                t = q_ids[q]
+                p_term_doc = 0.0
+                if t >= 0:
+                    k = start + np.searchsorted(doc_term_ids[start:end], t)
+                    if k < end and doc_term_ids[k] == t:
+                        p_term_doc = doc_term_probs[k]
+                smoothed_prob = (one_minus_lam * p_term_doc) + lam_col[q]
+                if smoothed_prob < 1e-12:
+                    smoothed_prob = 1e-12
+                log_score += math.log(smoothed_prob)
+            scores_out[d] = log_score
 
 
 class LanguageModelJM:
@@ -11,44 +49,81 @@ class LanguageModelJM:
         self.lam = lam
         self.doc_lens = {doc_id: len(tokens) for doc_id, tokens in corpus.items()}
         self.doc_counts = {doc_id: Counter(tokens) for doc_id, tokens in corpus.items()}
-        # Modele de la collection (Mc) 
-        all_tokens = [t for tokens in corpus.values() for t in tokens]
-        self.collection_len = len(all_tokens)
-        collection_counts = Counter(all_tokens)
+        # Modele de la collection (Mc), cumule document par document (sans liste de tous les tokens)
+        collection_counts = Counter()
+        for counts in self.doc_counts.values():
+            collection_counts.update(counts)
+        self.collection_len = sum(self.doc_lens.values())
         if self.collection_len > 0:
             self.collection_probs: Dict[str, float] = {
                 term: count / self.collection_len for term, count in collection_counts.items()
             }
         else:
             self.collection_probs = {}
+        # P(t|Md) = count / |d|, independant de la requete: calcule une seule fois
+        # (document vide: aucun terme, donc P(t|Md) = 0 pour tout t).
+        self.doc_term_probs: Dict[str, Dict[str, float]] = {
+            doc_id: {term: count / self.doc_lens[doc_id] for term, count in counts.items()}
+            for doc_id, counts in self.doc_counts.items()
+        }
+
+        # Encodage entier pour le noyau Numba: ids de termes, P(t|Md) de chaque document
+        # (tries par id de terme) au format CSR, et P(t|Mc) indexes par id.
+        self._doc_ids = list(corpus.keys())
+        self._term_index = {term: i for i, term in enumerate(collection_counts)}
+        self._col_probs = np.array(
+            [self.collection_probs.get(term, 0.0) for term in self._term_index], dtype=np.float64
+        )
+        offsets = [0]
+        term_ids = []
+        term_probs = []
+        for doc_id in self._doc_ids:
+            entries = sorted((self._term_index[t], p) for t, p in self.doc_term_probs[doc_id].items())
+            term_ids.extend(t for t, _ in entries)
+            term_probs.extend(p for _, p in entries)
+            offsets.append(len(term_ids))
+        self._doc_offsets = np.array(offsets, dtype=np.int64)
+        self._doc_term_ids = np.array(term_ids, dtype=np.int32)
+        self._doc_term_probs = np.array(term_probs, dtype=np.float64)
+        if _NUMBA_AVAILABLE:
+            # Compilation (ou chargement du cache) des maintenant, pas a la premiere requete.
+            self._score(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64), 1.0)
+
+    def _score(self, q_ids: np.ndarray, lam_col: np.ndarray, one_minus_lam: float) -> np.ndarray:
+        scores = np.empty(len(self._doc_ids))
+        _score_jm(
+            q_ids, lam_col, one_minus_lam, self._doc_term_ids, self._doc_term_probs, self._doc_offsets, scores,
+        )
+        return scores
 
     def search(self, query: str, top_k: Optional[int] = None):
-        query_tokens = preprocess(query)
-        scores = {}
-        
-        for doc_id, doc_tokens in self.corpus.items():
-            doc_len = self.doc_lens.get(doc_id, len(doc_tokens))
-            doc_probs = self.doc_counts.get(doc_id)
-            if doc_probs is None:
-                doc_probs = Counter(doc_tokens)
+        query_tokens = preprocess_query(query)
+        # P(qi | Mc) ne depend pas du document: calcule une fois par terme de la requete.
+        one_minus_lam = 1 - self.lam
+        lam_col = [self.lam * self.collection_probs.get(term, 0.0) for term in query_tokens]
+        if _NUMBA_AVAILABLE:
+            # Terme inconnu du corpus: id -1 (P(t|Md) = 0).
+            q_ids = np.array([self._term_index.get(t, -1) for t in query_tokens], dtype=np.int32)
+            scores = self._score(q_ids, np.array(lam_col, dtype=np.float64), float(one_minus_lam))
+            # Selection partielle si top_k; a score egal, l'ordre du corpus est conserve.
+            return [(self._doc_ids[i], float(scores[i])) for i in top_k_order(scores, top_k)]
+
+        scores = []
+        for doc_id in self._doc_ids:
+            doc_probs = self.doc_term_probs[doc_id]
             log_score = 0.0
-            
-            for term in query_tokens:
+
+            for term, lam_p_term_col in zip(query_tokens, lam_col):
                 # P(qi | Md)
-                p_term_doc = doc_probs[term] / doc_len if doc_len > 0 else 0
-                # P(qi | Mc)
-                p_term_col = self.collection_probs.get(term, 0.0)
-                
+                p_term_doc = doc_probs.get(term, 0.0)
+
                 # Lissage Jelinek-Mercer [cite: 1663]
-                smoothed_prob = ((1 - self.lam) * p_term_doc) + (self.lam * p_term_col)
+                smoothed_prob = (one_minus_lam * p_term_doc) + lam_p_term_col
 
                 # Work in log-space to avoid underflow when multiplying tiny probabilities.
                 smoothed_prob = max(smoothed_prob, 1e-12)
                 log_score += math.log(smoothed_prob)
             
-            scores[doc_id] = log_score
-            
-        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        if top_k is not None:
-            return ranked[:top_k]
-        return ranked
\ No newline at end of file
+            scores.append(log_score)
+
+        return [(self._doc_ids[i], scores[i]) for i in top_k_order(np.array(scores), top_k)]
\ No newline at end of file
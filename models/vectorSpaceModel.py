@@ -1,10 +1,11 @@
 from collections import Counter
 import math
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
 import numpy as np
 
-from corpus import preprocess
+from corpus import preprocess_query
+from ranking import top_k_order
 
 
 class VectorSpaceModel:
@@ -13,49 +14,111 @@ class VectorSpaceModel:
         self.corpus = corpus
         self.N = len(corpus)
         self.idf = self._compute_idf()
-        self._doc_vectors = {}
-        self._doc_norms = {}
-        for doc_id, tokens in self.corpus.items():
-            vec = self._compute_tf_idf_vector(tokens)
-            self._doc_vectors[doc_id] = vec
-            self._doc_norms[doc_id] = float(np.linalg.norm(vec))
-    
+        self._vocab_index = {word: i for i, word in enumerate(self.vocab)}
+
+        # Poids TF-IDF non nuls de chaque document, d'abord par document (CSR) pour les normes.
+        self._doc_ids = list(self.corpus.keys())
+        rows = []
+        indices = []
+        data = []
+        for j, tokens in enumerate(self.corpus.values()):
+            # Entrees triees par poids (normes identiques pour deux documents aux memes poids,
+            # a permutation des colonnes pres). Termes d'idf nulle (presents dans tous les
+            # documents) omis: poids nul, sans effet sur normes et produits.
+            cols = sorted(
+                (
+                    (self._vocab_index[word], (1 + math.log10(tf)) * self.idf[word])
+                    for word, tf in Counter(tokens).items()
+                    if self.idf.get(word, 0) != 0
+                ),
+                key=lambda entry: (entry[1], entry[0]),
+            )
+            rows.extend([j] * len(cols))
+            indices.extend(col for col, _ in cols)
+            data.extend(weight for _, weight in cols)
+        rows_arr = np.array(rows, dtype=np.int64)
+        indices_arr = np.array(indices, dtype=np.int64)
+        # Poids et normes en float32 (moitie moins de memoire a lire); les produits scalaires sont
+        # accumules en float64 par bincount. Les scores s'ecartent de ~1e-7 (relatif) du calcul
+        # float64: des documents a egalite en float64 (ex: ['c'] et ['c', 'c']) peuvent etre
+        # departages par l'arrondi, ce qui change leur ordre et parfois les documents du top_k.
+        data_arr = np.array(data, dtype=np.float32)
+        self._doc_norms = np.sqrt(
+            np.bincount(rows_arr, weights=data_arr * data_arr, minlength=self.N)
+        ).astype(np.float32)
+        # Inverses des normes, 0 pour un document sans poids (son produit scalaire est nul):
+        # le cosinus devient une multiplication, sans division ni condition par document.
+        self._doc_inv_norms = self._inv_norms(self._doc_norms)
+
+        # Puis par terme (CSC, sans scipy): les documents du terme c sont
+        # _col_rows[_col_ptr[c]:_col_ptr[c + 1]] (ordre du corpus), poids _col_data[...].
+        # Une requete ne lit que les colonnes de ses termes.
+        by_col = np.argsort(indices_arr, kind="stable")
+        self._col_ptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices_arr, minlength=len(self.vocab)), out=self._col_ptr[1:])
+        self._col_rows = rows_arr[by_col]
+        self._col_data = data_arr[by_col]
+
     def _compute_idf(self):
-        idf_scores = {}
-        for word in self.vocab:
-            # df: nombre de documents contenant le terme [cite: 1953]
-            df = sum(1 for tokens in self.corpus.values() if word in tokens)
-            # idf = log(N / df) [cite: 1958]
-            idf_scores[word] = math.log10(self.N / (df if df > 0 else 1))
-        return idf_scores
-
-    def _compute_tf_idf_vector(self, tokens):
-        vec = np.zeros(len(self.vocab))
-        token_counts = Counter(tokens)
-        for i, word in enumerate(self.vocab):
-            if word in token_counts:
-                tf = token_counts[word]
-                # Log normalization for TF: 1 + log10(tf) [cite: 1937]
-                w_tf = 1 + math.log10(tf)
-                vec[i] = w_tf * self.idf.get(word, 0)
-        return vec
+        # df: nombre de documents contenant le terme [cite: 1953], en un seul passage sur le corpus.
+        df = Counter()
+        for tokens in self.corpus.values():
+            df.update(set(tokens))
+        # idf = log(N / df) [cite: 1958]
+        return {word: math.log10(self.N / max(df.get(word, 0), 1)) for word in self.vocab}
+
+    @staticmethod
+    def _inv_norms(norms: np.ndarray) -> np.ndarray:
+        inv = np.zeros(norms.shape[0])
+        np.divide(1.0, norms, out=inv, where=norms > 0)
+        return inv
+
+    def _query_terms(self, tokens) -> Tuple[np.ndarray, np.ndarray]:
+        """Requete creuse: (colonnes des termes du vocabulaire, poids TF-IDF float32).
+
+        Termes hors vocabulaire ou d'idf nulle omis (poids nul).
+        """
+        cols = []
+        weights = []
+        for word, tf in Counter(tokens).items():
+            idf = self.idf.get(word, 0)
+            if idf == 0:
+                continue
+            cols.append(self._vocab_index[word])
+            # Log normalization for TF: 1 + log10(tf) [cite: 1937]
+            weights.append((1 + math.log10(tf)) * idf)
+        return np.array(cols, dtype=np.int32), np.array(weights, dtype=np.float32)
 
     def search(self, query: str, top_k: Optional[int] = None):
-        query_tokens = preprocess(query)
-        q_vec = self._compute_tf_idf_vector(query_tokens)
-        q_norm = float(np.linalg.norm(q_vec))
-        scores = {}
-        
-        for doc_id, d_vec in self._doc_vectors.items():
-            d_norm = self._doc_norms.get(doc_id, 0.0)
-            # Similarite Cosinus [cite: 1988]
-            if q_norm > 0 and d_norm > 0:
-                score = float(np.dot(q_vec, d_vec) / (q_norm * d_norm))
-            else:
-                score = 0.0
-            scores[doc_id] = score
-            
-        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        if top_k is not None:
-            return ranked[:top_k]
-        return ranked
\ No newline at end of file
+        return self.search_many([query], top_k=top_k)[0]
+
+    def search_many(self, queries: Sequence[str], top_k: Optional[int] = None):
+        """`search` pour plusieurs requetes, evaluees ensemble en un seul passage vectorise."""
+        scores = self._cosine_scores([self._query_terms(preprocess_query(query)) for query in queries])
+        return [self._rank(scores[:, j], top_k) for j in range(len(queries))]
+
+    def _cosine_scores(self, query_terms: Sequence[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Similarite cosinus (N, m) entre les documents et m requetes creuses (colonnes, poids)."""
+        m = len(query_terms)
+        q_norms = np.array([np.linalg.norm(weights) for _, weights in query_terms], dtype=np.float32)
+        q_inv_norms = self._inv_norms(q_norms)
+        dots = np.zeros(self.N * m)
+        if m:
+            cols = np.concatenate([c for c, _ in query_terms]).astype(np.int64)
+            weights = np.concatenate([w for _, w in query_terms])
+            query_of_col = np.repeat(np.arange(m), [c.shape[0] for c, _ in query_terms])
+            # Concatenation des postings des colonnes de la requete (plages _col_ptr[c]:_col_ptr[c + 1]).
+            starts = self._col_ptr[cols]
+            lengths = self._col_ptr[cols + 1] - starts
+            offsets = np.cumsum(lengths) - lengths
+            postings = np.arange(lengths.sum()) - np.repeat(offsets - starts, lengths)
+            # Scatter-add dans les cellules (document, requete).
+            cells = self._col_rows[postings] * m + np.repeat(query_of_col, lengths)
+            products = self._col_data[postings] * np.repeat(weights, lengths)
+            dots = np.bincount(cells, weights=products, minlength=self.N * m)
+        # Similarite Cosinus [cite: 1988]
+        return dots.reshape(self.N, m) * (self._doc_inv_norms[:, None] * q_inv_norms[None, :])
+
+    def _rank(self, scores: np.ndarray, top_k: Optional[int]):
+        # Selection partielle si top_k; a score egal, l'ordre du corpus est conserve.
+        return [(self._doc_ids[i], float(scores[i])) for i in top_k_order(scores, top_k)]
@@ -0,0 +1,121 @@
+"""Pretraitement accelere (optionnel) via Numba.
+
+Meme resultat que `corpus.preprocess`, mais le scan des caracteres et le reperage des
+stopwords tournent dans un noyau compile (`@njit`). Sans `numba`, `preprocess` retombe
+sur `corpus.preprocess`.
+"""
+
+from functools import lru_cache
+import sys
+from typing import FrozenSet, List, Tuple
+
+import numpy as np
+
+from corpus import STOPWORDS, preprocess as _preprocess_py
+
+try:
+    from numba import njit  # type: ignore
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# FNV-1a 64 bits (les multiplications debordent modulo 2**64, comme en C).
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+_APOSTROPHE = 39
+
+# Filtre de Bloom (1024 bits, 1 bit par stopword) devant la recherche dichotomique:
+# la plupart des tokens ne sont pas des stopwords et sont rejetes en un test de bit.
+_BLOOM_BITS = 1024
+_BLOOM_MASK = np.uint64(_BLOOM_BITS - 1)
+
+# Classe de chaque octet: bit 0 = [a-z0-9], bit 1 = apostrophe.
+_ALNUM = 1
+_QUOTE = 2
+_CHAR_CLASS = np.zeros(256, dtype=np.uint8)
+for _c in b"abcdefghijklmnopqrstuvwxyz0123456789":
+    _CHAR_CLASS[_c] = _ALNUM
+_CHAR_CLASS[_APOSTROPHE] = _QUOTE
+del _c
+
+
+def _fnv1a(word: bytes) -> int:
+    h = int(_FNV_OFFSET)
+    for byte in word:
+        h = ((h ^ byte) * int(_FNV_PRIME)) & 0xFFFFFFFFFFFFFFFF
+    return h
+
+
+@lru_cache(maxsize=8)
+def _stopword_hashes(stopwords: FrozenSet[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashes tries des stopwords + filtre de Bloom correspondant (uint64[_BLOOM_BITS // 64])."""
+    hashes = sorted({_fnv1a(w.encode("utf-8")) for w in stopwords})
+    bloom = np.zeros(_BLOOM_BITS // 64, dtype=np.uint64)
+    for h in hashes:
+        bit = h & (_BLOOM_BITS - 1)
+        bloom[bit >> 6] |= np.uint64(1 << (bit & 63))
+    return np.array(hashes, dtype=np.uint64), bloom
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _scan(buf, sw_hashes, sw_bloom, char_class):
+        """Retourne (starts, ends, maybe_stop) pour `[a-z0-9]+(?:'[a-z0-9]+)?`.
+
+        `maybe_stop` marque les tokens dont le hash FNV-1a figure dans `sw_hashes`
+        (a confirmer cote Python: une collision reste possible).
+        """
+        n = buf.shape[0]
+        cap = n // 2 + 1
+        starts = np.empty(cap, dtype=np.int32)
+        ends = np.empty(cap, dtype=np.int32)
+        maybe_stop = np.empty(cap, dtype=np.bool_)
+        n_sw = sw_hashes.shape[0]
+        count = 0
+        i = 0
+        while i < n:
+            if not (char_class[buf[i]] & _ALNUM):
+                i += 1
+                continue
+            start = i
+            h = _FNV_OFFSET
+            while i < n and char_class[buf[i]] & _ALNUM:
+                h = (h ^ np.uint64(buf[i])) * _FNV_PRIME
+                i += 1
+            if i + 1 < n and char_class[buf[i]] & _QUOTE and char_class[buf[i + 1]] & _ALNUM:
+                h = (h ^ np.uint64(_APOSTROPHE)) * _FNV_PRIME
+                i += 1
+                while i < n and char_class[buf[i]] & _ALNUM:
+                    h = (h ^ np.uint64(buf[i])) * _FNV_PRIME
+                    i += 1
+            bit = h & _BLOOM_MASK
+            flagged = False
+            if (sw_bloom[bit >> np.uint64(6)] >> (bit & np.uint64(63))) & np.uint64(1):
+                k = np.searchsorted(sw_hashes, h)
+                flagged = k < n_sw and sw_hashes[k] == h
+            starts[count] = start
+            ends[count] = i
+            maybe_stop[count] = flagged
+            count += 1
+        return starts[:count], ends[:count], maybe_stop[:count]
+
+
+def preprocess(text: str, *, stopwords: FrozenSet[str] = STOPWORDS) -> List[str]:
+    """Tokenisation + normalisation + filtrage stopwords (noyau Numba si disponible)."""
+    if not NUMBA_AVAILABLE:
+        return _preprocess_py(text, stopwords=stopwords)
+
+    # Apres `lower()`, les caracteres non ASCII sont des octets >= 0x80 en UTF-8:
+    # ils separent les tokens, exactement comme avec la regex.
+    raw = text.lower().encode("utf-8", "surrogatepass")
+    sw_hashes, sw_bloom = _stopword_hashes(frozenset(stopwords))
+    starts, ends, maybe_stop = _scan(np.frombuffer(raw, dtype=np.uint8), sw_hashes, sw_bloom, _CHAR_CLASS)
+    out: List[str] = []
+    for start, end, flagged in zip(starts.tolist(), ends.tolist(), maybe_stop.tolist()):
+        token = raw[start:end].decode("ascii")
+        if flagged and token in stopwords:
+            continue
+        out.append(sys.intern(token))
+    return out
@@ -0,0 +1,21 @@
+"""Classement des documents a partir d'un tableau de scores (ordre du corpus)."""
+
+from typing import Optional
+
+import numpy as np
+
+
+def top_k_order(scores: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+    """Indices des documents par score decroissant; a score egal, l'ordre du corpus est conserve.
+
+    Si 0 < top_k < N: selection partielle O(N) (seuil = k-ieme meilleur score), puis tri stable
+    des seuls candidats. Sinon: tri stable complet, tronque comme `liste[:top_k]`.
+    """
+    n = scores.shape[0]
+    if top_k is None or top_k <= 0 or top_k >= n:
+        order = np.argsort(-scores, kind="stable")
+        return order if top_k is None else order[:top_k]
+    threshold = np.partition(scores, n - top_k)[n - top_k]
+    # Candidats (>= seuil) dans l'ordre du corpus: le tri stable garde les premiers ex aequo.
+    candidates = np.flatnonzero(scores >= threshold)
+    return candidates[np.argsort(-scores[candidates], kind="stable")][:top_k]
@@ -0,0 +1,136 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator, Optional
+
+
+class RateLimiter:
+    """Sliding-window limiter: at most `rpm` calls per `window_s` seconds.
+
+    Thread-safe and shared per process (one instance per API client).
+    `rpm <= 0` disables the limit.
+    """
+
+    def __init__(self, rpm: int, window_s: float = 60.0):
+        self.rpm = rpm
+        self.window_s = window_s
+        self._calls: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def wait_if_throttled(self) -> float:
+        """Block until a call is allowed, record it, and return the time slept (s)."""
+        if self.rpm <= 0:
+            return 0.0
+        slept = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.window_s:
+                    self._calls.popleft()
+                if len(self._calls) < self.rpm:
+                    self._calls.append(now)
+                    return slept
+                wait_s = self.window_s - (now - self._calls[0])
+            time.sleep(wait_s)
+            slept += wait_s
+
+
+class ConcurrencyController:
+    """AIMD limit on the number of concurrent API calls.
+
+    - Success under `latency_target_s`: additive increase (`+alpha`, up to `max_concurrency`).
+    - Slow success or rate limit (429): multiplicative decrease (`*beta`, down to 1).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        *,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        latency_target_s: float = 3.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.alpha = alpha
+        self.beta = beta
+        self.latency_target_s = latency_target_s
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self, latency_s: float) -> None:
+        with self._cond:
+            if latency_s <= self.latency_target_s:
+                self._limit = min(float(self.max_concurrency), self._limit + self.alpha)
+            else:
+                self._limit = max(1.0, self._limit * self.beta)
+            self._cond.notify_all()
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            self._limit = max(1.0, self._limit * self.beta)
+
+
+# Full-jitter exponential backoff for 429 retries (seconds).
+BACKOFF_BASE_S = 1.0
+BACKOFF_CAP_S = 32.0
+
+
+def backoff_delay(attempt: int, hint_s: Optional[float] = None) -> float:
+    """Seconds to sleep before retry `attempt` (0-based) after a 429.
+
+    Jitter spreads out retries from parallel workers instead of having them all wake up
+    at the same time. A server-suggested delay `hint_s` is treated as a minimum.
+    """
+    if hint_s is None:
+        return random.uniform(0, min(BACKOFF_CAP_S, BACKOFF_BASE_S * (2**attempt)))
+    return hint_s + random.uniform(0, 0.5 * hint_s)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Best-effort detection of a provider 429 / quota error."""
+    exc_text = str(exc)
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    return status == 429 or "429" in exc_text or "RESOURCE_EXHAUSTED" in exc_text
+
+
+_limiters = {}
+_controllers = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rpm: int) -> RateLimiter:
+    """Process-wide limiter for `name` (recreated if `rpm` changes)."""
+    with _registry_lock:
+        limiter: Optional[RateLimiter] = _limiters.get(name)
+        if limiter is None or limiter.rpm != rpm:
+            limiter = _limiters[name] = RateLimiter(rpm)
+        return limiter
+
+
+def get_concurrency_controller(name: str, max_concurrency: int) -> ConcurrencyController:
+    """Process-wide AIMD controller for `name` (recreated if the cap changes)."""
+    with _registry_lock:
+        controller: Optional[ConcurrencyController] = _controllers.get(name)
+        if controller is None or controller.max_concurrency != max(1, max_concurrency):
+            controller = _controllers[name] = ConcurrencyController(max_concurrency)
+        return controller